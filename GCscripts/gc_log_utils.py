@@ -0,0 +1,126 @@
+import binascii
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Point budget for heap size, memory usage, region count and scaling traces, which are decimated to each bucket's
+# extremes even when they carry one reading per GC cycle. Pause and phase duration traces are always drawn whole,
+# so no single pause or phase can disappear from the plot
+MAX_LINE_POINTS = 5000
+
+# Each parallel chunk holds at least this many characters, so logs are scanned in parallel only from
+# two chunks (32M characters) on a host with two or more cores; smaller logs would not recover the
+# roughly one second a fresh worker spends importing the plotter modules
+PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Workers are started without forking the caller, which may be a threaded Dash request handler
+_MP_CONTEXT = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+def iter_log_lines(log_content, chunk_size=1024 * 1024):
+    # Split the log a newline-aligned chunk at a time, so only one chunk's lines are held in memory at once
+    start = 0
+    while start < len(log_content):
+        end = log_content.find('\n', start + chunk_size)
+        end = len(log_content) if end == -1 else end + 1
+        yield from log_content[start:end].splitlines()
+        start = end
+
+def downsample(x, y, max_points=MAX_LINE_POINTS):
+    # Keep the first, last, lowest and highest point of each bucket, so peaks and drops survive the decimation
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+    bucket_size = -(-len(y) // (max_points // 2))
+    full = len(y) - len(y) % bucket_size
+    buckets = y[:full].reshape(-1, bucket_size)
+    offsets = np.arange(0, full, bucket_size)
+    keep = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1), [0, len(y) - 1]]
+    if full < len(y):
+        tail = y[full:]
+        keep.append([full + tail.argmin(), full + tail.argmax()])
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+def split_for_workers(text, chunk_size=PARALLEL_CHUNK_SIZE):
+    # One newline-aligned chunk per available core, or the whole text when it is too small to split
+    workers = min(os.cpu_count() or 1, len(text) // chunk_size)
+    if workers < 2:
+        return [text]
+    bounds = [0]
+    for i in range(1, workers):
+        # Split points never move backwards, so a single very long line cannot make chunks overlap
+        newline = text.find('\n', max(i * len(text) // workers, bounds[-1]))
+        bounds.append(len(text) if newline == -1 else newline + 1)
+    bounds.append(len(text))
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+def parallel_scan(scan, text, chunk_size=PARALLEL_CHUNK_SIZE, mp_context=_MP_CONTEXT):
+    # Returns scan's result for each chunk in log order; scan must be a module-level function so workers can import it
+    chunks = split_for_workers(text, chunk_size)
+    if len(chunks) == 1:
+        return [scan(text)]
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=mp_context) as executor:
+        return list(executor.map(scan, chunks))
+
+def extend_columns(columns, more):
+    # Append a later chunk's column lists, recursing into nested tables of columns
+    for name, values in more.items():
+        if isinstance(values, dict):
+            extend_columns(columns[name], values)
+        else:
+            columns[name].extend(values)
+
+def record_groups(master_re, record_patterns):
+    # Slice of match.groups() holding each record kind's own capture groups in a fused alternation pattern
+    return {
+        kind: slice(master_re.groupindex[kind], master_re.groupindex[kind] + re.compile(pattern).groups)
+        for kind, pattern in record_patterns.items()
+    }
+
+def build_frame(columns, dtypes, categories):
+    # Numeric columns hold the captured digit strings and are converted a whole column at a time;
+    # label columns with a handful of distinct values are stored as categoricals
+    frame = {}
+    for name, values in columns.items():
+        if name in dtypes:
+            values = np.array(values, dtype=object).astype(dtypes[name])
+        elif name in categories:
+            values = pd.Categorical(values)
+        frame[name] = values
+    return pd.DataFrame(frame)
+
+def decode_upload(contents):
+    # Decode a Dash upload: a base64 data URL, or plain text passed through as is. Stray bytes that are
+    # not UTF-8 become U+FFFD instead of failing the whole upload
+    if ',' in contents:
+        _, content_string = contents.split(',')
+        # a2b_base64 reads the ASCII string in place, where b64decode first copies it to bytes
+        return binascii.a2b_base64(content_string).decode('utf-8', errors='replace')
+    return contents
+
+class DigestLRU:
+    # Parsed results of the most recent uploads and the figures built from them so far, oldest first.
+    # Entries are keyed on a digest of the upload so the cache does not hold on to the upload itself
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load_cached(self, contents, decode, parse):
+        # Returns the (parsed, figures) entry for the upload, decoding and parsing it only on a miss
+        key = hashlib.blake2b(contents.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            entry = (parse(decode(contents)), {})
+        with self._lock:
+            # Re-insert as the most recently used entry and evict the oldest ones
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return entry
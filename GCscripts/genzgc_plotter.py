@@ -1,12 +1,10 @@
-import base64 
-import io
 import re
-import pandas as pd
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from gc_log_utils import parallel_scan, extend_columns, record_groups, build_frame, DigestLRU, decode_upload
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -65,6 +63,61 @@ generation_mapping = {
     'Y': 'Young'
 }
 
+# Regular expression patterns for the GC pause, concurrent phase, page size and cause messages;
+# each one matches the text following 'GC(<cycle>) ' on a log line. Pause and phase names are
+# words that start with a letter, so they can never swallow the digits of the duration that
+# follows and the engine has nothing to backtrack over. "Y: Pause Mark Start 12.991ms" parses as
+# 'Mark Start' with 12.991ms; the earlier pattern read it as 'Mark Start 1' with 2.991ms.
+gc_pause_pattern = r"(\w): Pause ([A-Za-z]\w*(?:\s[A-Za-z]\w*)+(?: \(\w+\))?)\s*(\d+\.\d+)ms"
+gc_concurrent_pattern = r"(\w): Concurrent ([A-Za-z]\w*(?:\s[A-Za-z]\w*)*) (\d+\.\d+)ms"
+gc_pgsz_pattern = r"(\w): (\w+) Pages:\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)M\s+(\d+)M\s+(\d+)M"
+gc_cause_pattern = r"(Minor|Major) Collection \((.+?)\) (\d+)M\((\d+)%\)->(\d+)M\((\d+)%\) (\d+\.\d+)s"
+jdk_version_pattern = r"Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)"
+
+_RECORD_PATTERNS = {
+    'pause': gc_pause_pattern,
+    'concurrent': gc_concurrent_pattern,
+    'pgsz': gc_pgsz_pattern,
+    'cause': gc_cause_pattern,
+    'version': jdk_version_pattern
+}
+# One pattern for every record line, scanned over the whole log with finditer. All alternatives share
+# the line-start prefix '[<uptime>s][<decorator>]... ', which keeps the scan cheap on lines that match
+# nothing. Group 1 is the uptime, group 2 the GC cycle, and lastgroup names the record kind.
+# The pattern is linear-time as written, so it stays on the stdlib re module; the google-re2
+# binding runs this scan several times slower because of its per-match group extraction.
+_MASTER_RE = re.compile(
+    r"^(?:\[[^\]\n]*\])*?\[(\d+\.\d+)s\](?:\[[^\]\n]*\])* (?:GC\((\d+)\) (?:"
+    + '|'.join(f'(?P<{kind}>{_RECORD_PATTERNS[kind]})' for kind in ('pause', 'concurrent', 'pgsz', 'cause'))
+    + f")|(?P<version>{jdk_version_pattern}))",
+    re.MULTILINE
+)
+# Slice of match.groups() holding each record kind's own capture groups
+_RECORD_GROUPS = record_groups(_MASTER_RE, _RECORD_PATTERNS)
+
+# Parsed results of the most recent uploads and the figures built from them so far
+_parsed_logs = DigestLRU(max_entries=4)
+
+# Dtypes of the numeric columns in the parsed DataFrames
+_COLUMN_DTYPES = {
+    'Time': 'float64',
+    'GCCycle': 'int64',
+    'Duration': 'float64',
+    'Candidates': 'int64',
+    'Selected': 'int64',
+    'In-Place': 'int64',
+    'SizesMB': 'int64',
+    'EmptyMB': 'int64',
+    'RelocatedMB': 'int64',
+    'BeforeUsageMB': 'int64',
+    'BeforePercent': 'int64',
+    'AfterUsageMB': 'int64',
+    'AfterPercent': 'int64'
+}
+
+# Label columns with a handful of distinct values, stored as categoricals
+_CATEGORY_COLUMNS = {'Generation', 'PauseType', 'PhaseType', 'PageType', 'CollectionType', 'Cause'}
+
 @app.callback(
     [Output('main-graph', 'figure'),
      Output('filename-display', 'children')],
@@ -77,14 +130,14 @@ def update_output(contents, filename, selected_value):
     if contents is None:
         return dash.no_update, "No file selected"
 
-    content_type, content_string = contents.split(',')
-    decoded = base64.b64decode(content_string)
-    log_content = io.StringIO(decoded.decode('utf-8')).read()
+    # Parse the GC log content (cached, so switching views does not re-parse the same upload)
+    parsed, figures = load_gc_log(contents)
+    gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version = parsed
 
-    # Parse the GC log content
-    gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version = parse_gc_log(log_content) 
-    
-    fig = generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value)
+    # Each view is built once per upload; switching back to it reuses the figure
+    fig = figures.get(selected_value)
+    if fig is None:
+        fig = figures[selected_value] = generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value)
    
     # Update the filename display
     filename_display = f"Selected file: {filename}"
@@ -93,240 +146,260 @@ def update_output(contents, filename, selected_value):
 
     return fig, filename_display      
 
+def load_gc_log(contents):
+    return _parsed_logs.load_cached(contents, decode_upload, parse_gc_log)
+
 def parse_gc_log(log_content):
+    # Large logs are scanned a chunk per core; the columns are joined in log order
+    results = parallel_scan(_scan_records, log_content)
+    gc_pause_data, concurrent_phase_data, gc_pgsz_data, gc_cause_data, jdk_version = results[0]
+    for result in results[1:]:
+        for table, chunk_table in zip((gc_pause_data, concurrent_phase_data, gc_pgsz_data, gc_cause_data), result[:4]):
+            extend_columns(table, chunk_table)
+        # The last version line in the log wins, as in the serial scan
+        jdk_version = result[4] or jdk_version
+
+    # Convert the column lists to DataFrames, one typed array per column
+    gc_pause_df = _build_frame(gc_pause_data)
+    concurrent_phase_df = _build_frame(concurrent_phase_data)
+    gc_pgsz_df = _build_frame(gc_pgsz_data)
+    gc_cause_df = _build_frame(gc_cause_data)
 
-    # Initialize an empty list to store the parsed data
-    gc_pause_data = []
-    concurrent_phase_data = []
-    gc_pgsz_data = []
-    gc_cause_data = []
+    return gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version
 
-    # Regular expression patterns for GC pause and concurrent phase log lines
-    gc_pause_pattern = re.compile(r"\[(\d+\.\d+)s\].*\bGC\((\d+)\) (\w): Pause ((?:\w+\s)+\w+(?: \(\w+\))?)(?:\s+)?(\d+\.\d+)ms")
-    gc_concurrent_pattern = re.compile(r"\[(\d+\.\d+)s\].*\bGC\((\d+)\) (\w): Concurrent ([\w\s]+) (\d+\.\d+)ms")
-    gc_pgsz_pattern = re.compile(r"\[(\d+\.\d+)s\].*GC\((\d+)\) (\w): (\w+) Pages:\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)M\s+(\d+)M\s+(\d+)M")
-    gc_cause_pattern = re.compile(r"\[(\d+\.\d+)s\].*GC\((\d+)\) (Minor|Major) Collection \((.+?)\) (\d+)M\((\d+)%\)->(\d+)M\((\d+)%\) (\d+\.\d+)s")
-    jdk_version_pattern = re.compile(r"\[\d+\.\d+s\]\[info\]\[gc,init\] Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)")
+def _scan_records(log_content):
+    # Runs in worker processes for large logs, so it only returns plain lists of the matched fields
+    # Initialize one list per column to store the parsed data
+    gc_pause_data = {'Time': [], 'GCCycle': [], 'Generation': [], 'PauseType': [], 'Duration': []}
+    concurrent_phase_data = {'Time': [], 'GCCycle': [], 'Generation': [], 'PhaseType': [], 'Duration': []}
+    gc_pgsz_data = {'Time': [], 'GCCycle': [], 'Generation': [], 'PageType': [], 'Candidates': [], 'Selected': [],
+                    'In-Place': [], 'SizesMB': [], 'EmptyMB': [], 'RelocatedMB': []}
+    gc_cause_data = {'Time': [], 'GCCycle': [], 'CollectionType': [], 'Cause': [], 'BeforeUsageMB': [],
+                     'BeforePercent': [], 'AfterUsageMB': [], 'AfterPercent': [], 'Duration': []}
 
     jdk_version = None
-    lines = log_content.splitlines()
-
-    for line in lines:
-        pause_match = gc_pause_pattern.search(line)
-        concurrent_match = gc_concurrent_pattern.search(line)
-        pgsz_match = gc_pgsz_pattern.search(line)
-        cause_match = gc_cause_pattern.search(line)
-        version_match = jdk_version_pattern.search(line)
-
-        if pause_match:
-            time, gc_cycle, gen_type, pause_type, duration = pause_match.groups()
-            full_gen_type = generation_mapping.get(gen_type.upper(), "Unknown")  # Default to 'Unknown' if key not found
-            gc_pause_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'Generation': full_gen_type,
-                'PauseType': pause_type,
-                'Duration': float(duration)
-            })
-        elif concurrent_match:
-            time, gc_cycle, gen_type, phase_type, duration = concurrent_match.groups()
-            full_gen_type = generation_mapping.get(gen_type.upper(), "Unknown")  # Default to 'Unknown' if key not found
-            concurrent_phase_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'Generation': full_gen_type,
-                'PhaseType': phase_type,
-                'Duration': float(duration)
-            })
-        elif pgsz_match:
-            time, gc_cycle, gen_type, page_type, candidates, selected, in_place, size, empty, relocated = pgsz_match.groups()
-            full_gen_type = generation_mapping.get(gen_type.upper(), "Unknown")  # Default to 'Unknown' if key not found
-            gc_pgsz_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'Generation': full_gen_type,
-                'PageType': page_type,
-                'Candidates': int(candidates),
-                'Selected': int(selected),
-                'In-Place': int(in_place),
-                'Sizes': size + 'M',
-                'Empty': empty + 'M',
-                'Relocated': relocated + 'M'
-            })
-        elif cause_match:
-            time, gc_cycle, collection_type, cause, before_usage, before_percent, after_usage, after_percent, duration = cause_match.groups()
-            gc_cause_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'CollectionType': collection_type,
-                'Cause': cause,
-                'BeforeUsage': before_usage + 'M',
-                'BeforePercent': before_percent + '%',
-                'AfterUsage': after_usage + 'M',
-                'AfterPercent': after_percent + '%',
-                'Duration': float(duration)
-            })
-        elif version_match:
-            jdk_version = version_match.group(1)
-
-    # Convert the lists of data to DataFrames
-    gc_pause_df = pd.DataFrame(gc_pause_data)
-    concurrent_phase_df = pd.DataFrame(concurrent_phase_data)
-    gc_pgsz_df = pd.DataFrame(gc_pgsz_data)
-    gc_cause_df = pd.DataFrame(gc_cause_data)
 
-    return gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version
+    # Scan the whole buffer; lines that match no record are skipped inside the regex engine
+    for match in _MASTER_RE.finditer(log_content):
+        kind = match.lastgroup
+        time, gc_cycle = match.group(1, 2)
+        fields = match.groups()[_RECORD_GROUPS[kind]]
+
+        if kind == 'pause':
+            gen_type, pause_type, duration = fields
+            gc_pause_data['Time'].append(time)
+            gc_pause_data['GCCycle'].append(gc_cycle)
+            gc_pause_data['Generation'].append(gen_type)
+            gc_pause_data['PauseType'].append(pause_type)
+            gc_pause_data['Duration'].append(duration)
+        elif kind == 'concurrent':
+            gen_type, phase_type, duration = fields
+            concurrent_phase_data['Time'].append(time)
+            concurrent_phase_data['GCCycle'].append(gc_cycle)
+            concurrent_phase_data['Generation'].append(gen_type)
+            concurrent_phase_data['PhaseType'].append(phase_type)
+            concurrent_phase_data['Duration'].append(duration)
+        elif kind == 'pgsz':
+            gen_type, page_type, candidates, selected, in_place, size, empty, relocated = fields
+            gc_pgsz_data['Time'].append(time)
+            gc_pgsz_data['GCCycle'].append(gc_cycle)
+            gc_pgsz_data['Generation'].append(gen_type)
+            gc_pgsz_data['PageType'].append(page_type)
+            gc_pgsz_data['Candidates'].append(candidates)
+            gc_pgsz_data['Selected'].append(selected)
+            gc_pgsz_data['In-Place'].append(in_place)
+            gc_pgsz_data['SizesMB'].append(size)
+            gc_pgsz_data['EmptyMB'].append(empty)
+            gc_pgsz_data['RelocatedMB'].append(relocated)
+        elif kind == 'cause':
+            collection_type, cause, before_usage, before_percent, after_usage, after_percent, duration = fields
+            gc_cause_data['Time'].append(time)
+            gc_cause_data['GCCycle'].append(gc_cycle)
+            gc_cause_data['CollectionType'].append(collection_type)
+            gc_cause_data['Cause'].append(cause)
+            gc_cause_data['BeforeUsageMB'].append(before_usage)
+            gc_cause_data['BeforePercent'].append(before_percent)
+            gc_cause_data['AfterUsageMB'].append(after_usage)
+            gc_cause_data['AfterPercent'].append(after_percent)
+            gc_cause_data['Duration'].append(duration)
+        elif kind == 'version':
+            jdk_version = fields[0]
+
+    return gc_pause_data, concurrent_phase_data, gc_pgsz_data, gc_cause_data, jdk_version
+
+def _build_frame(columns):
+    frame = build_frame(columns, _COLUMN_DTYPES, _CATEGORY_COLUMNS)
+    if 'Generation' in frame:
+        # Records carry the raw generation letter; only the few distinct letters are mapped to names
+        frame['Generation'] = frame['Generation'].map(
+            lambda gen_type: generation_mapping.get(gen_type.upper(), "Unknown")).astype('category')  # Default to 'Unknown' if key not found
+    return frame
 
 def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value):
-    fig = go.Figure()
-
     if gc_pause_df.empty or concurrent_phase_df.empty or gc_pgsz_df.empty or gc_cause_df.empty:
         print("dataframes are empty")
-        return fig  # Return an empty figure
+        return go.Figure()  # Return an empty figure
 
     if selected_value == 'pause':
-        # Add traces for each pause type and generation
-        for pause_type in gc_pause_df['PauseType'].unique():
-            for generation in gc_pause_df['Generation'].unique():
-                pause_df = gc_pause_df[(gc_pause_df['PauseType'] == pause_type) & (gc_pause_df['Generation'] == generation)]
-                fig.add_trace(go.Scatter(
-                    x=pause_df['Time'],
-                    y=pause_df['Duration'],
-                    mode='lines+markers',
-                    name=f'{generation} Pause {pause_type}'
-                ))
-        fig.update_layout(
-            title='GC Pause Duration Over Runtime by Generation',
-            xaxis_title='Time (s)',
-            yaxis_title='Duration (ms)',
-            legend_title='Pause Types and Generations'
-        )
-        return fig
-
+        return _build_pause_fig(gc_pause_df)
     elif selected_value == 'concurrent':
-        # Add traces for each concurrent phase type and generation
-        for phase_type in concurrent_phase_df['PhaseType'].unique():
-            for generation in concurrent_phase_df['Generation'].unique():
-                phase_df = concurrent_phase_df[(concurrent_phase_df['PhaseType'] == phase_type) & (concurrent_phase_df['Generation'] == generation)]
-                fig.add_trace(go.Scatter(
-                    x=phase_df['Time'],
-                    y=phase_df['Duration'],
-                    mode='lines+markers',
-                    name=f'{generation} Concurrent {phase_type}'
-                ))
-        fig.update_layout(
-            title='Concurrent Phase Duration Over Runtime by Generation',
-            xaxis_title='Time (s)',
-            yaxis_title='Duration (ms)',
-            legend_title='Concurrent Phases and Generations'
-        )
-        return fig
-
+        return _build_concurrent_fig(concurrent_phase_df)
     elif selected_value == 'pgsz':
-        # Group the data by 'Time', 'Generation, and 'PageType' to get the sum of pages for each type at each time point
-        pgsz_grouped = gc_pgsz_df.groupby(['Time', 'Generation', 'PageType']).sum().reset_index()
-
-        fig = make_subplots(
-            rows=2, cols=1,
-            subplot_titles=('Old Generation', 'Young Generation'),
-            shared_xaxes=True
-        )
-
-        # Plot each page type and generation combination
-        for (generation, page_type), group in pgsz_grouped.groupby(['Generation','PageType']):
-            trace = go.Scatter(
-                x=group['Time'],
-                y=group['Sizes'].str.replace('M', '').astype(float),
-                name=f'{generation} {page_type}',
-                mode='lines+markers',
-                marker=dict(symbol='cross', size=10),  # Adjust the size
-                line=dict(width=1)
-            )
-            if generation == 'Old':
-                fig.add_trace(trace, row=1, col=1)  # First row for Old
-            elif generation == 'Young':
-                fig.add_trace(trace, row=2, col=1)  # Second row for Young
-
-        fig.update_layout(
-            title='Page Sizes Over Time by Generation',
-            height=800
-        )
-        fig.update_xaxes(title_text='Time (s)', row=1, col=1) 
-        fig.update_yaxes(title_text='Page Sizes (MB)',row=1, col=1)
-
-        fig.update_xaxes(title_text='Time (s)', row=2, col=1) 
-        fig.update_yaxes(title_text='Page Sizes (MB)',row=2, col=1) 
-
-        return fig
-
-    # Plot logic for GC causes
+        return _build_pgsz_fig(gc_pgsz_df)
     elif selected_value == 'cause':
-        fig = make_subplots(
-            rows=2, cols=2,
-            specs=[[{'type': 'xy'}, {'type': 'table'}], 
-                   [{'type': 'domain'}, {'type': 'domain'}]],
-            subplot_titles=('GC Usage Over Time', 'Summary Table', 'GC Cause Distribution', 'GC Duration Categories'),
-            vertical_spacing=0.2  # Adjust the space between the subplots
-        )
-        # Iterate through each collection type for a more detailed breakdown
-        for collection_type in gc_cause_df['CollectionType'].unique():
-            filtered_df = gc_cause_df[gc_cause_df['CollectionType'] == collection_type]
-        
-            # Plot the 'BeforeUsage' and 'AfterUsage' for each GC cycle by collection type
+        return _build_cause_fig(gc_cause_df)
+
+def _build_pause_fig(gc_pause_df):
+    fig = go.Figure()
+    # Partition the data in one pass, then add traces pause type first and generation second, each in log order
+    pause_groups = dict(list(gc_pause_df.groupby(['PauseType', 'Generation'], sort=False, observed=True)))
+    for pause_type in gc_pause_df['PauseType'].unique():
+        for generation in gc_pause_df['Generation'].unique():
+            # Pairs that never occur still get an (empty) trace, which keeps the legend and colors of a full grid
+            pause_df = pause_groups.get((pause_type, generation), gc_pause_df.iloc[:0])
             fig.add_trace(go.Scatter(
-                x=filtered_df['Time'],
-                y=filtered_df['BeforeUsage'].str.replace('M', '').astype(float),
+                x=pause_df['Time'],
+                y=pause_df['Duration'],
                 mode='lines+markers',
-                name=f'Before {collection_type} Usage'
-            ), row=1, col=1)
-
+                name=f'{generation} Pause {pause_type}'
+            ))
+    fig.update_layout(
+        title='GC Pause Duration Over Runtime by Generation',
+        xaxis_title='Time (s)',
+        yaxis_title='Duration (ms)',
+        legend_title='Pause Types and Generations'
+    )
+    return fig
+
+def _build_concurrent_fig(concurrent_phase_df):
+    fig = go.Figure()
+    # Partition the data in one pass, then add traces phase type first and generation second, each in log order
+    phase_groups = dict(list(concurrent_phase_df.groupby(['PhaseType', 'Generation'], sort=False, observed=True)))
+    for phase_type in concurrent_phase_df['PhaseType'].unique():
+        for generation in concurrent_phase_df['Generation'].unique():
+            phase_df = phase_groups.get((phase_type, generation), concurrent_phase_df.iloc[:0])
             fig.add_trace(go.Scatter(
-                x=filtered_df['Time'],
-                y=filtered_df['AfterUsage'].str.replace('M', '').astype(float),
+                x=phase_df['Time'],
+                y=phase_df['Duration'],
                 mode='lines+markers',
-                name=f'After {collection_type} Usage'
-            ), row=1, col=1)
-
-        # Create the summary table
-        duration_sum = gc_cause_df.groupby(['CollectionType', 'Cause'])['Duration'].sum().reset_index()
-        duration_sum['Label'] = duration_sum['CollectionType'] + ' - ' + duration_sum['Cause']
-
-        fig.add_trace(go.Table(
-            header=dict(values=['Collection Type', 'Cause', 'Duration'],
-                        align='left', font=dict(size=12, color='white'), fill_color='gray'),
-            cells=dict(values=[duration_sum['CollectionType'], duration_sum['Cause'], duration_sum['Duration']],
-                        align='left')
-        ), row=1, col=2)
-
-        # Create a pie chart for the distribution of GC causes
-        cause_counts = gc_cause_df['Cause'].value_counts()
-        fig.add_trace(go.Pie(
-            labels=cause_counts.index,
-            values=cause_counts.values,
-            name='GC Cause Distribution',
-            showlegend=False  # Hide legend for the pie chart
-        ), row=2, col=1)
-
-        # Create a pie chart for GC duration categories
-        fig.add_trace(go.Pie(
-            labels=duration_sum['Label'],
-            values=duration_sum['Duration'],
-            name='GC Duration Categories',
-            showlegend=False
-        ), row=2, col=2)
-
-        # Update layout for the first row
-        fig.update_xaxes(title_text='Time (s)', row=1, col=1)
-        fig.update_yaxes(title_text='Memory Usage (MB)', row=1, col=1)
-        
-        # Update the overall layout
-        fig.update_layout(
-            title_text='GC Cause Details, Distribution, and Duration by Collection Type',
-            height=800,
-            width=1400,
+                name=f'{generation} Concurrent {phase_type}'
+            ))
+    fig.update_layout(
+        title='Concurrent Phase Duration Over Runtime by Generation',
+        xaxis_title='Time (s)',
+        yaxis_title='Duration (ms)',
+        legend_title='Concurrent Phases and Generations'
+    )
+    return fig
+
+def _build_pgsz_fig(gc_pgsz_df):
+    # Group the data by 'Time', 'Generation, and 'PageType' to get the sum of pages for each type at each time point.
+    # Logs normally have at most one line per type and time point, in time order, and then the sum changes nothing
+    if gc_pgsz_df['Time'].is_monotonic_increasing and not gc_pgsz_df.duplicated(['Time', 'Generation', 'PageType']).any():
+        pgsz_grouped = gc_pgsz_df
+    else:
+        pgsz_grouped = gc_pgsz_df.groupby(['Time', 'Generation', 'PageType'], observed=True).sum().reset_index()
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Old Generation', 'Young Generation'),
+        shared_xaxes=True
+    )
+
+    # Plot each page type and generation combination
+    for (generation, page_type), group in pgsz_grouped.groupby(['Generation','PageType'], observed=True):
+        trace = go.Scatter(
+            x=group['Time'],
+            y=group['SizesMB'],
+            name=f'{generation} {page_type}',
+            mode='lines+markers',
+            marker=dict(symbol='cross', size=10),  # Adjust the size
+            line=dict(width=1)
         )
-        return fig
+        if generation == 'Old':
+            fig.add_trace(trace, row=1, col=1)  # First row for Old
+        elif generation == 'Young':
+            fig.add_trace(trace, row=2, col=1)  # Second row for Young
+
+    fig.update_layout(
+        title='Page Sizes Over Time by Generation',
+        height=800
+    )
+    fig.update_xaxes(title_text='Time (s)', row=1, col=1) 
+    fig.update_yaxes(title_text='Page Sizes (MB)',row=1, col=1)
+
+    fig.update_xaxes(title_text='Time (s)', row=2, col=1) 
+    fig.update_yaxes(title_text='Page Sizes (MB)',row=2, col=1) 
+
+    return fig
+
+# Plot logic for GC causes
+def _build_cause_fig(gc_cause_df):
+    fig = make_subplots(
+        rows=2, cols=2,
+        specs=[[{'type': 'xy'}, {'type': 'table'}], 
+               [{'type': 'domain'}, {'type': 'domain'}]],
+        subplot_titles=('GC Usage Over Time', 'Summary Table', 'GC Cause Distribution', 'GC Duration Categories'),
+        vertical_spacing=0.2  # Adjust the space between the subplots
+    )
+    # Partition by collection type in one pass for a more detailed breakdown
+    for collection_type, filtered_df in gc_cause_df.groupby('CollectionType', sort=False, observed=True):
+        # Plot the 'BeforeUsage' and 'AfterUsage' for each GC cycle by collection type
+        fig.add_trace(go.Scatter(
+            x=filtered_df['Time'],
+            y=filtered_df['BeforeUsageMB'],
+            mode='lines+markers',
+            name=f'Before {collection_type} Usage'
+        ), row=1, col=1)
+
+        fig.add_trace(go.Scatter(
+            x=filtered_df['Time'],
+            y=filtered_df['AfterUsageMB'],
+            mode='lines+markers',
+            name=f'After {collection_type} Usage'
+        ), row=1, col=1)
+
+    # Create the summary table; the per-cause counts for the distribution pie come out of the same pass
+    duration_sum = gc_cause_df.groupby(['CollectionType', 'Cause'], observed=True)['Duration'].agg(['sum', 'size']).reset_index()
+    duration_sum = duration_sum.rename(columns={'sum': 'Duration'})
+    duration_sum['Label'] = duration_sum['CollectionType'].astype(str) + ' - ' + duration_sum['Cause'].astype(str)
+
+    fig.add_trace(go.Table(
+        header=dict(values=['Collection Type', 'Cause', 'Duration'],
+                    align='left', font=dict(size=12, color='white'), fill_color='gray'),
+        cells=dict(values=[duration_sum['CollectionType'], duration_sum['Cause'], duration_sum['Duration']],
+                    format=[None, None, '.3f'], suffix=[None, None, 's'],  # Durations stay numeric; the table formats them
+                    align='left')
+    ), row=1, col=2)
+
+    # Create a pie chart for the distribution of GC causes
+    cause_counts = duration_sum.groupby('Cause', observed=True)['size'].sum().sort_values(ascending=False, kind='stable')
+    fig.add_trace(go.Pie(
+        labels=cause_counts.index,
+        values=cause_counts.values,
+        name='GC Cause Distribution',
+        showlegend=False  # Hide legend for the pie chart
+    ), row=2, col=1)
+
+    # Create a pie chart for GC duration categories
+    fig.add_trace(go.Pie(
+        labels=duration_sum['Label'],
+        values=duration_sum['Duration'],
+        name='GC Duration Categories',
+        showlegend=False
+    ), row=2, col=2)
+
+    # Update layout for the first row
+    fig.update_xaxes(title_text='Time (s)', row=1, col=1)
+    fig.update_yaxes(title_text='Memory Usage (MB)', row=1, col=1)
+    
+    # Update the overall layout
+    fig.update_layout(
+        title_text='GC Cause Details, Distribution, and Duration by Collection Type',
+        height=800,
+        width=1400,
+    )
+    return fig
 
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8053)
-
+    app.run(debug=True, port=8053)
@@ -1,15 +1,15 @@
-import base64
 import io
 import re
 import os
-import pandas as pd
+import numpy as np
 import subprocess
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from parse_g1_regions import plot_regions, parse_g1_log
+from gc_log_utils import iter_log_lines, downsample, parallel_scan, extend_columns, record_groups, build_frame, DigestLRU, decode_upload
 
 # Define colors and markers for both G1 and Parallel GCs
 colors = {
@@ -58,6 +58,58 @@ custom_marker_size = {
     'cross': 6  # Smaller size for the 'cross' marker
 }
 
+# Marker styles of the per-pause traces, built once; the total heap is drawn as a line instead
+_HEAP_MARKERS = {pause: dict(color=colors[pause], symbol=symbol) for pause, symbol in markers.items() if pause != 'TotalHeap'}
+_DURATION_MARKERS = {pause: dict(marker, size=10) for pause, marker in _HEAP_MARKERS.items()}
+
+# Regex patterns for the pause, scaling and JDK version lines, after the leading uptime decorator
+pause_pattern = r".*?Pause (\w+)(?: \((.*?)\))? ?(?:\((.*?)\))? (\d+)M->(\d+)M\((\d+)M\) (\d+\.\d+)ms"
+scaling_pattern = r".*?GC\(\d+\) User=(\d+\.\d+)s Sys=(\d+\.\d+)s Real=(\d+\.\d+)s"
+jdk_version_pattern = r"\[info\]\[gc,init\] Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)"
+
+# Fused alternation of the patterns above sharing the uptime group; lastgroup names the record kind that matched
+_RECORD_PATTERNS = {
+    'scaling': scaling_pattern,
+    'pause': pause_pattern,
+    'version': jdk_version_pattern
+}
+_MASTER_RE = re.compile(r"\[(\d+\.\d+)s\](?:" + '|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in _RECORD_PATTERNS.items()) + ")")
+# Slice of match.groups() holding each record kind's own capture groups
+_RECORD_GROUPS = record_groups(_MASTER_RE, _RECORD_PATTERNS)
+
+g1_patterns = [
+    re.compile(r'\[.*\]\[.*G1.*\]'),  # Identifies G1 collector usage
+    re.compile(r'garbage-first heap')  # Identifies 'garbage-first heap' phrase
+]
+
+# Dtypes of the numeric columns in the parsed DataFrames; heap sizes are in MB and fit in 32 bits
+_COLUMN_DTYPES = {
+    'Runtime': 'float64',
+    'HeapBefore': 'int32',
+    'HeapAfter': 'int32',
+    'TotalHeap': 'int32',
+    'Duration': 'float64',
+    'UserTime': 'float64',
+    'SysTime': 'float64',
+    'RealTime': 'float64'
+}
+
+# Label columns with a handful of distinct values, stored as categoricals
+_CATEGORY_COLUMNS = {'PauseName'}
+
+# Parsed results of the most recent uploads and the figures built from them so far
+_parsed_logs = DigestLRU(max_entries=4)
+
+# Dropdown options for every log, and with the region view added for G1 logs
+dropdown_options = [
+    {'label': 'Heap Occupancy Before GC', 'value': 'before'},
+    {'label': 'Heap Occupancy After GC', 'value': 'after'},
+    {'label': 'Pause Duration', 'value': 'duration'},  # New option for pause duration
+    {'label': 'GC Scaling Plot', 'value': 'scaling'},  # New option for GC scaling plot
+    {'label': 'Pause Summary', 'value': 'summary'}
+]
+g1_dropdown_options = dropdown_options + [{'label': 'G1 GC Region', 'value': 'g1-regions'}]
+
 # Initialize the Dash app
 app = dash.Dash(__name__)
 
@@ -91,13 +143,7 @@ app.layout = html.Div([
     html.Div([
         dcc.Dropdown(
             id='menu-selection',
-            options=[
-                {'label': 'Heap Occupancy Before GC', 'value': 'before'},
-                {'label': 'Heap Occupancy After GC', 'value': 'after'},
-                {'label': 'Pause Duration', 'value': 'duration'},  # New option for pause duration
-                {'label': 'GC Scaling Plot', 'value': 'scaling'},  # New option for GC scaling plot
-                {'label': 'Pause Summary', 'value': 'summary'}
-            ],
+            options=dropdown_options,
             value='before',
             style={'width': '100%'}
         )
@@ -116,96 +162,110 @@ app.layout = html.Div([
      Output('menu-selection', 'options')],  # Add the output for the dropdown options
     [Input('menu-selection', 'value'),
      Input('upload-data', 'contents'),
-     Input('upload-data', 'filename')]
+     Input('upload-data', 'filename')],
+    [State('menu-selection', 'options')]
 )
-def update_output(selected_value, contents, filename):
+def update_output(selected_value, contents, filename, current_options):
     if contents is None or filename is None:
         return dash.no_update, "No file selected", dash.no_update
 
     try:
-        # Decode the file content based on its format
-        if ',' in contents:
-            _, content_string = contents.split(',')
-            log_content = base64.b64decode(content_string).decode('utf-8')
-        else:
-            log_content = contents
-
-        # Parse the GC log content
-        data_df, scaling_data_df, is_g1, jdk_version = parse_gc_log(log_content)
+        # Parse the GC log content (cached, so switching views does not re-decode or re-parse the same upload)
+        parsed, view_data = load_gc_log(contents)
+        data_df, scaling_data_df, is_g1, jdk_version = parsed
 
         # Validate the parsed data
         if data_df.empty or scaling_data_df.empty:
             return dash.no_update, "The log file could not be parsed. Please check the file format and ensure it contains GC log entries.", dash.no_update
         
-        # Setup the dropdown options based on the log type
-        dropdown_options = [
-            {'label': 'Heap Occupancy Before GC', 'value': 'before'},
-            {'label': 'Heap Occupancy After GC', 'value': 'after'},
-            {'label': 'Pause Duration', 'value': 'duration'},
-            {'label': 'GC Scaling Plot', 'value': 'scaling'},
-            {'label': 'Pause Summary', 'value': 'summary'}
-        ]
-        if is_g1:
-            dropdown_options.append({'label': 'G1 GC Region', 'value': 'g1-regions'})
-
-        # Generate the appropriate plot based on the selected value
-        if is_g1 and selected_value == 'g1-regions':
-            g1_region_data = parse_g1_log(log_content) 
-            fig = plot_regions(g1_region_data)
-        else:
-            fig = generate_plot(data_df, scaling_data_df, selected_value)
+        # Setup the dropdown options based on the log type, and only send them when they change
+        options = g1_dropdown_options if is_g1 else dropdown_options
+        if options == current_options:
+            options = dash.no_update
+
+        # Generate the appropriate plot based on the selected value, reusing the figure if this upload already built it
+        fig = view_data.get(selected_value)
+        if fig is None:
+            if is_g1 and selected_value == 'g1-regions':
+                # The region data needs its own pass over the log
+                fig = plot_regions(parse_g1_log(decode_upload(contents)))
+            else:
+                fig = generate_plot(data_df, scaling_data_df, selected_value)
+            view_data[selected_value] = fig
 
         # Display the name of the selected file
         filename_display = f"Selected file: {filename}"
         if jdk_version:
             filename_display += f" | JDK Version: {jdk_version}"
 
-        return fig, filename_display, dropdown_options
+        return fig, filename_display, options
     except Exception as e:
         # Handle unexpected errors during file processing
         return dash.no_update, f"An error occurred while processing the file: {e}", dash.no_update
 
+def load_gc_log(contents):
+    return _parsed_logs.load_cached(contents, decode_upload, parse_gc_log)
+
 def parse_gc_log(log_content):
-    # Define regex patterns for matching various log details
-    pause_pattern = r"\[(\d+\.\d+)s\].*?Pause (\w+)(?: \((.*?)\))? ?(?:\((.*?)\))? (\d+)M->(\d+)M\((\d+)M\) (\d+\.\d+)ms"
-    scaling_pattern = r"\[(\d+\.\d+)s\].*?GC\(\d+\) User=(\d+\.\d+)s Sys=(\d+\.\d+)s Real=(\d+\.\d+)s"
-    jdk_version_pattern = re.compile(r"\[\d+\.\d+s\]\[info\]\[gc,init\] Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)")
-    g1_patterns = [
-        re.compile(r'\[.*\]\[.*G1.*\]'),  # Identifies G1 collector usage
-        re.compile(r'garbage-first heap')  # Identifies 'garbage-first heap' phrase
-    ]
+    # Large logs are scanned a chunk per core; the columns are joined in log order
+    results = parallel_scan(_scan_records, log_content)
+    gc_data, scaling_data, is_g1, jdk_version = results[0]
+    for chunk_gc_data, chunk_scaling_data, chunk_is_g1, chunk_jdk_version in results[1:]:
+        extend_columns(gc_data, chunk_gc_data)
+        extend_columns(scaling_data, chunk_scaling_data)
+        is_g1 = is_g1 or chunk_is_g1
+        # The last version line in the log wins, as in a single scan
+        jdk_version = chunk_jdk_version or jdk_version
+
+    # Convert parsed data into DataFrames
+    if not gc_data['Runtime']:
+        raise ValueError("Parsed data is empty. The log file may not contain expected GC log entries.")
+    data_df = _build_frame(gc_data)
+    scaling_data_df = _build_frame(scaling_data)
+    user_time, real_time = scaling_data_df['UserTime'].to_numpy(), scaling_data_df['RealTime'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaling_data_df['ScalingFactor'] = np.where(real_time != 0, user_time / real_time, np.inf)
     
-    # Initialize variables to store parsed data and G1 collector status
+    return data_df, scaling_data_df, is_g1, jdk_version
+
+def _scan_records(log_content):
+    # Runs in worker processes for large logs, so it only returns plain lists of the matched fields
+    # Initialize one list per column to store the parsed data
+    scaling_data = {'Runtime': [], 'UserTime': [], 'SysTime': [], 'RealTime': []}
+    gc_data = {'Runtime': [], 'HeapBefore': [], 'HeapAfter': [], 'TotalHeap': [], 'PauseName': [], 'Duration': []}
     is_g1 = False
-    scaling_data = []
-    gc_data = []
     jdk_version = None
     
     # Process each line of the log content
-    lines = log_content.splitlines()
-    for line in lines:
-        # Check for G1 collector usage
-        if any(pattern.search(line) for pattern in g1_patterns):
+    for line in iter_log_lines(log_content):
+        # Check for G1 collector usage until found; only lines with one of the patterns' literals can match
+        if not is_g1 and ('G1' in line or 'garbage-first heap' in line) and any(pattern.search(line) for pattern in g1_patterns):
             is_g1 = True
+
+        # Substring tests are much cheaper than the regex and rule out most lines
+        if 'Pause ' not in line and 'User=' not in line and ' Version: ' not in line:
+            continue
+
+        # Match scaling, pause and version information in a single regex pass
+        match = _MASTER_RE.search(line)
+        if not match:
+            continue
+        kind = match.lastgroup
+        fields = match.groups()[_RECORD_GROUPS[kind]]
+
+        # Process scaling information
+        if kind == 'scaling':
+            user_time, sys_time, real_time = fields
+            scaling_data['Runtime'].append(match.group(1))
+            scaling_data['UserTime'].append(user_time)
+            scaling_data['SysTime'].append(sys_time)
+            scaling_data['RealTime'].append(real_time)
         
-        # Match and process scaling information
-        scaling_match = re.search(scaling_pattern, line)
-        if scaling_match:
-            runtime, user_time, sys_time, real_time = map(float, scaling_match.groups())
-            scaling_factor = user_time / real_time if real_time else float('inf')
-            scaling_data.append({
-                "Runtime": runtime,
-                "UserTime": user_time,
-                "SysTime": sys_time,
-                "RealTime": real_time,
-                "ScalingFactor": scaling_factor
-            })
-        
-        # Match and process GC pause information
-        pause_match = re.search(pause_pattern, line)
-        if pause_match:
-            # runtime, pause_type, heap_before, heap_after, total_heap, duration = pause_match.groups()
-            runtime, pause_type, description, pause_cause, heap_before, heap_after, total_heap, duration = pause_match.groups()
+        # Process GC pause information
+        elif kind == 'pause':
+            runtime = match.group(1)
+            # pause_type, heap_before, heap_after, total_heap, duration = fields
+            pause_type, description, pause_cause, heap_before, heap_after, total_heap, duration = fields
             if description: 
                 if "Mixed" in description or "Concurrent Start" in description:
                     pause_type = description  
@@ -219,26 +279,20 @@ def parse_gc_log(log_content):
             else: 
                 pause_name = pause_type
                                    
-            gc_data.append({
-                "Runtime": float(runtime),
-                "HeapBefore": int(heap_before),
-                "HeapAfter": int(heap_after),
-                "TotalHeap": int(total_heap),
-                "PauseName": pause_name,
-                "Duration": float(duration)
-            })
-        # Look for JDK version
-        version_match = jdk_version_pattern.search(line)
-        if version_match:
-            jdk_version = version_match.group(1)
+            gc_data['Runtime'].append(runtime)
+            gc_data['HeapBefore'].append(heap_before)
+            gc_data['HeapAfter'].append(heap_after)
+            gc_data['TotalHeap'].append(total_heap)
+            gc_data['PauseName'].append(pause_name)
+            gc_data['Duration'].append(duration)
+        # Record the JDK version
+        elif kind == 'version':
+            jdk_version = fields[0]
 
-    # Convert parsed data into DataFrames
-    if not gc_data:
-        raise ValueError("Parsed data is empty. The log file may not contain expected GC log entries.")
-    data_df = pd.DataFrame(gc_data)
-    scaling_data_df = pd.DataFrame(scaling_data)
-    
-    return data_df, scaling_data_df, is_g1, jdk_version
+    return gc_data, scaling_data, is_g1, jdk_version
+
+def _build_frame(columns):
+    return build_frame(columns, _COLUMN_DTYPES, _CATEGORY_COLUMNS)
 
 def generate_plot(data_df, scaling_data_df, selected_value):
     fig = go.Figure()
@@ -249,16 +303,18 @@ def generate_plot(data_df, scaling_data_df, selected_value):
     # Handle the 'scaling' plot option
     if selected_value == 'scaling':
         if not scaling_data_df.empty:
-            fig.add_trace(go.Scatter(
-                x=scaling_data_df['Runtime'],
-                y=scaling_data_df['ScalingFactor'],
+            runtime, values = downsample(scaling_data_df['Runtime'], scaling_data_df['ScalingFactor'])
+            fig.add_trace(go.Scattergl(
+                x=runtime,
+                y=values,
                 mode='lines+markers',
                 name='GC Scaling Factor',
                 marker=dict(color='purple', size=10)
             ))
-            fig.add_trace(go.Scatter(
-                x=scaling_data_df['Runtime'],
-                y=scaling_data_df['SysTime'],
+            runtime, values = downsample(scaling_data_df['Runtime'], scaling_data_df['SysTime'])
+            fig.add_trace(go.Scattergl(
+                x=runtime,
+                y=values,
                 mode='lines+markers',
                 name='System Time',
                 marker=dict(color='orange', size=10)
@@ -267,7 +323,8 @@ def generate_plot(data_df, scaling_data_df, selected_value):
                 title='GC Scaling and System Time Over Runtime',
                 xaxis_title='Runtime (seconds)',
                 yaxis_title='Scaling Factor & System Time',
-                legend_title='Data Points'
+                legend_title='Data Points',
+                hovermode='x unified'  # One hover label per runtime rather than a nearest-point search on every mouse move
             )
         else:
             fig.update_layout(
@@ -287,21 +344,23 @@ def generate_plot(data_df, scaling_data_df, selected_value):
     # Handle the 'duration' plot option
     elif selected_value == 'duration':
         title = 'GC Pause Durations Over Runtime'
-        for pause, color in colors.items():
-            if pause != "TotalHeap":
-                subset = data_df[data_df['PauseName'] == pause]
-                if not subset.empty:
-                    fig.add_trace(go.Scatter(
-                        x=subset['Runtime'],
-                        y=subset['Duration'],
-                        mode='markers',
-                        name=pause,
-                        marker=dict(color=color, size=10, symbol=markers[pause])
-                    ))
+        # Partition the pauses by name in one pass; traces keep the order of the colors table
+        pause_groups = dict(list(data_df.groupby('PauseName', sort=False, observed=True)))
+        for pause, marker in _DURATION_MARKERS.items():
+            subset = pause_groups.get(pause)
+            if subset is not None:
+                fig.add_trace(go.Scattergl(
+                    x=subset['Runtime'],
+                    y=subset['Duration'],
+                    mode='markers',
+                    name=pause,
+                    marker=marker
+                ))
         fig.update_layout(
             title=title,
             xaxis_title='Runtime (seconds)',
-            yaxis_title='Pause Duration (ms)'
+            yaxis_title='Pause Duration (ms)',
+            hovermode='x unified'
         )
         # Return the figure early for the 'duration' option
         return fig
@@ -309,14 +368,15 @@ def generate_plot(data_df, scaling_data_df, selected_value):
     # Handle the 'summary' plot option
     elif selected_value == 'summary':
        # Calculate stats and overhead
-        pause_summary = data_df.groupby('PauseName')['Duration'].agg(['count', 'min', 'max', 'sum'])
+        pause_summary = data_df.groupby('PauseName', observed=True)['Duration'].agg(['count', 'min', 'max', 'sum'])
         total_runtime = data_df['Runtime'].max()
         total_runtime_ms = total_runtime * 1000
         pause_summary['Overhead'] = (pause_summary['sum'] / total_runtime_ms) * 100
         # Format overhead values for readability
         overhead_threshold = 0.01
-        pause_summary['Overhead'] = pause_summary['Overhead'].apply(
-            lambda x: f"~0" if x < overhead_threshold else f"{x:.2f}"
+        overhead = pause_summary['Overhead'].to_numpy()
+        pause_summary['Overhead'] = np.where(
+            overhead < overhead_threshold, "~0", np.char.mod("%.2f", overhead)
         )
         # Sort the summary by 'sum' in descending order
         pause_summary = pause_summary.sort_values(by='sum', ascending=False)
@@ -358,34 +418,38 @@ def generate_plot(data_df, scaling_data_df, selected_value):
         return fig
 
     # Plotting the TotalHeap line
-    fig.add_trace(go.Scatter(
-        x=data_df['Runtime'], 
-        y=data_df['TotalHeap'], 
-        mode='lines+markers', 
+    runtime, total_heap = downsample(data_df['Runtime'], data_df['TotalHeap'])
+    fig.add_trace(go.Scattergl(
+        x=runtime, 
+        y=total_heap, 
+        mode='lines', 
         name='Total Heap', 
         line=dict(color=colors['TotalHeap'])
     ))
 
     # Add markers for each GC pause event, excluding the total heap line
-    for pause, color in colors.items():
-        if pause != "TotalHeap":
-            subset = data_df[data_df['PauseName'] == pause]
-            if not subset.empty:
-                fig.add_trace(go.Scatter(
-                    x=subset['Runtime'], 
-                    y=subset[y_value], 
-                    mode='markers', 
-                    name=pause, 
-                    marker=dict(color=color, symbol=markers[pause])
-                ))
+    pause_groups = dict(list(data_df.groupby('PauseName', sort=False, observed=True)))
+    for pause, marker in _HEAP_MARKERS.items():
+        subset = pause_groups.get(pause)
+        if subset is not None:
+            fig.add_trace(go.Scattergl(
+                x=subset['Runtime'], 
+                y=subset[y_value], 
+                mode='markers', 
+                name=pause, 
+                marker=marker
+            ))
 
     fig.update_layout(
         title=title, 
         xaxis_title='Runtime (seconds)', 
-        yaxis_title='Memory (MB)'
+        yaxis_title='Memory (MB)',
+        hovermode='x unified'
     )
     return fig
 
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8051)
+    # The reloader imports the module twice; keep the debugger opt-in
+    app.run(debug=os.environ.get('HEAP_PLOTTER_DEBUG') == '1',
+            use_reloader=False, threaded=True, port=8051)
 
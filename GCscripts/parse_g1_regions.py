@@ -1,35 +1,62 @@
 import re
 import sys
+import numpy as np
 import plotly.graph_objs as go
+from gc_log_utils import iter_log_lines, downsample, parallel_scan, extend_columns
+
+# Regex patterns to match the necessary information, compiled once at import
+runtime_pattern = re.compile(r"\[(\d+\.\d+)s\]")
+region_pattern = re.compile(r"GC\(\d+\) (\w+) regions: (\d+)->(\d+)")
+region_size_pattern = re.compile(r"Heap Region Size: (\d+)M")
+
+# Dtypes of the region columns; region counts fit in 32 bits
+_COLUMN_DTYPES = {
+    'Runtime': 'float64',
+    'Before': 'int32',
+    'After': 'int32'
+}
 
 def parse_g1_log(log_content):
-    # Regex patterns to match the necessary information
-    runtime_pattern = r"\[(\d+\.\d+)s\]"
-    region_pattern = r"GC\(\d+\) (\w+) regions: (\d+)->(\d+)"
-    region_size_pattern = r"Heap Region Size: (\d+)M"
+    # Large logs are scanned a chunk per core; each region's columns are joined in log order
+    results = parallel_scan(_scan_regions, log_content)
+    region_data = results[0]
+    for chunk_region_data in results[1:]:
+        extend_columns(region_data, chunk_region_data)
 
-    # Variables to store the parsed data
-    region_data = {'Eden': [], 'Survivor': [], 'Old': [], 'Humongous': []}
+    # Convert the captured digit strings a whole column at a time
+    return {
+        region_type: {name: np.array(values, dtype=object).astype(_COLUMN_DTYPES[name]) for name, values in columns.items()}
+        for region_type, columns in region_data.items()
+    }
+
+def _scan_regions(log_content):
+    # Runs in worker processes for large logs, so it only returns plain lists of the matched fields
+    # Variables to store the parsed data, one list per column for each region type
+    region_data = {region_type: {'Runtime': [], 'Before': [], 'After': []} for region_type in ('Eden', 'Survivor', 'Old', 'Humongous')}
     region_size = 0
 
-    lines = log_content.splitlines()
-    for line in lines:
+    for line in iter_log_lines(log_content):
         # Check for region size
-        size_match = re.search(region_size_pattern, line)
-        if size_match:
-            region_size = int(size_match.group(1))
+        if 'Heap Region Size' in line:
+            size_match = region_size_pattern.search(line)
+            if size_match:
+                region_size = int(size_match.group(1))
+                continue
+
+        # Only lines with the literal part of the region pattern can match it
+        if ' regions: ' not in line:
             continue
 
         # Check for runtime and region information
-        runtime_match = re.search(runtime_pattern, line)
-        region_match = re.search(region_pattern, line)
+        runtime_match = runtime_pattern.search(line)
+        region_match = region_pattern.search(line)
         if runtime_match and region_match:
-            runtime = float(runtime_match.group(1))
             region_type, before, after = region_match.groups()
-            before = int(before)
-            after = int(after)    
-            if region_type in region_data:
-                region_data[region_type].append((runtime, before, after))
+            columns = region_data.get(region_type)
+            if columns is not None:
+                columns['Runtime'].append(runtime_match.group(1))
+                columns['Before'].append(before)
+                columns['After'].append(after)
 
     return region_data
 
@@ -37,10 +64,10 @@ def parse_g1_log(log_content):
 def plot_regions(region_data):
     fig = go.Figure()
 
-    for region_type, data_points in region_data.items():
-        runtime, before, after = zip(*data_points)
+    for region_type, columns in region_data.items():
+        runtime, before = downsample(columns['Runtime'], columns['Before'])
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=runtime,
             y=before,
             mode='lines+markers',
@@ -48,7 +75,8 @@ def plot_regions(region_data):
             line=dict(shape='hv'),
             #connectgaps=True,  # this will connect gaps in the data
         ))
-        fig.add_trace(go.Scatter(
+        runtime, after = downsample(columns['Runtime'], columns['After'])
+        fig.add_trace(go.Scattergl(
             x=runtime,
             y=after,
             mode='lines+markers',
@@ -61,6 +89,7 @@ def plot_regions(region_data):
         xaxis_title='Runtime (s)',
         yaxis_title='Total Count of Regions',
         legend_title='Region States',
+        hovermode='x unified',  # One hover label per runtime rather than a nearest-point search on every mouse move
         legend=dict(
             itemsizing='constant',
             traceorder='normal',
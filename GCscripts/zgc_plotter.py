@@ -1,12 +1,10 @@
-import base64 
-import io
 import re
-import pandas as pd
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from gc_log_utils import iter_log_lines, downsample, record_groups, build_frame, DigestLRU, decode_upload
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -60,6 +58,50 @@ app.layout = html.Div([
 
 ])
 
+# Regular expression patterns for GC pause, concurrent phase, page size, cause and JDK version log lines,
+# after the leading uptime decorator
+gc_pause_pattern = r".*\bGC\((\d+)\) Pause (\w+)(?: Start| End)? (\d+\.\d+)ms"
+gc_concurrent_pattern = r".*GC\((\d+)\) Concurrent (\w+) (\d+\.\d+)ms"
+gc_pgsz_pattern = r".*GC\((\d+)\) (\w+) Pages: (\d+) / (\d+)M, Empty: (\d+)M, Relocated: (\d+)M, In-Place: (\d+)"
+gc_cause_pattern = r".*GC\((\d+)\) Garbage Collection \((.+?)\) (\d+)M\((\d+)%\)->(\d+)M\((\d+)%\)"
+jdk_version_pattern = r"\[info\]\[gc,init\] Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)"
+
+# Fused alternation of the patterns above sharing the uptime group, tried in this order on each line;
+# lastgroup names the record kind that matched
+_RECORD_PATTERNS = {
+    'pause': gc_pause_pattern,
+    'concurrent': gc_concurrent_pattern,
+    'pgsz': gc_pgsz_pattern,
+    'cause': gc_cause_pattern,
+    'version': jdk_version_pattern
+}
+_MASTER_RE = re.compile(r"\[(\d+\.\d+)s\](?:" + '|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in _RECORD_PATTERNS.items()) + ")")
+# Slice of match.groups() holding each record kind's own capture groups
+_RECORD_GROUPS = record_groups(_MASTER_RE, _RECORD_PATTERNS)
+
+# Parsed results of the most recent uploads and the figures built from them so far
+_parsed_logs = DigestLRU(max_entries=4)
+
+# Dtypes of the numeric columns in the parsed DataFrames; cycle numbers, page counts, sizes in MB and
+# percentages fit in 32 bits
+_COLUMN_DTYPES = {
+    'Time': 'float64',
+    'GCCycle': 'int32',
+    'Duration': 'float64',
+    'UsedPages': 'int32',
+    'TotalPages': 'int32',
+    'EmptyPages': 'int32',
+    'RelocatedPages': 'int32',
+    'InPlacePages': 'int32',
+    'BeforeUsage': 'int32',
+    'BeforePercent': 'int32',
+    'AfterUsage': 'int32',
+    'AfterPercent': 'int32'
+}
+
+# Label columns with a handful of distinct values, stored as categoricals
+_CATEGORY_COLUMNS = {'PauseType', 'PhaseType', 'PageType', 'Cause'}
+
 @app.callback(
     [Output('main-graph', 'figure'),
      Output('filename-display', 'children')],
@@ -72,14 +114,14 @@ def update_output(contents, filename, selected_value):
     if contents is None:
         return dash.no_update, "No file selected"
 
-    content_type, content_string = contents.split(',')
-    decoded = base64.b64decode(content_string)
-    log_content = io.StringIO(decoded.decode('utf-8')).read()
+    # Parse the GC log content (cached, so switching views does not re-parse the same upload)
+    parsed, figures = load_gc_log(contents)
+    gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version = parsed
 
-    # Parse the GC log content
-    gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version = parse_gc_log(log_content) 
-    
-    fig = generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value)
+    # Each view is built once per upload; switching back to it reuses the figure
+    fig = figures.get(selected_value)
+    if fig is None:
+        fig = figures[selected_value] = generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value)
    
     # Update the filename display
     filename_display = f"Selected file: {filename}"
@@ -88,91 +130,91 @@ def update_output(contents, filename, selected_value):
 
     return fig, filename_display      
 
-def parse_gc_log(log_content):
+def load_gc_log(contents):
+    return _parsed_logs.load_cached(contents, decode_upload, parse_gc_log)
 
-    # Initialize an empty list to store the parsed data
-    gc_pause_data = []
-    concurrent_phase_data = []
-    gc_pgsz_data = []
-    gc_cause_data = []
+def parse_gc_log(log_content):
 
-    # Regular expression patterns for GC pause and concurrent phase log lines
-    gc_pause_pattern = re.compile(r"\[(\d+\.\d+)s\].*\bGC\((\d+)\) Pause (\w+)(?: Start| End)? (\d+\.\d+)ms")
-    gc_concurrent_pattern = re.compile(r"\[(\d+\.\d+)s\].*GC\((\d+)\) Concurrent (\w+) (\d+\.\d+)ms")
-    gc_pgsz_pattern = re.compile(r"\[(\d+\.\d+)s\].*GC\((\d+)\) (\w+) Pages: (\d+) / (\d+)M, Empty: (\d+)M, Relocated: (\d+)M, In-Place: (\d+)")
-    gc_cause_pattern = re.compile(r"\[(\d+\.\d+)s\].*GC\((\d+)\) Garbage Collection \((.+?)\) (\d+)M\((\d+)%\)->(\d+)M\((\d+)%\)")
-    jdk_version_pattern = re.compile(r"\[\d+\.\d+s\]\[info\]\[gc,init\] Version: (\d+\.\d+\.\d+\+\d+-LTS(?:-\d+)?) \(release\)")
+    # Initialize one list per column to store the parsed data
+    gc_pause_data = {'Time': [], 'GCCycle': [], 'PauseType': [], 'Duration': []}
+    concurrent_phase_data = {'Time': [], 'GCCycle': [], 'PhaseType': [], 'Duration': []}
+    gc_pgsz_data = {'Time': [], 'GCCycle': [], 'PageType': [], 'UsedPages': [], 'TotalPages': [],
+                    'EmptyPages': [], 'RelocatedPages': [], 'InPlacePages': []}
+    gc_cause_data = {'Time': [], 'GCCycle': [], 'Cause': [], 'BeforeUsage': [], 'BeforePercent': [],
+                     'AfterUsage': [], 'AfterPercent': []}
 
     jdk_version = None
-    lines = log_content.splitlines()
-
-    for line in lines:
-        pause_match = gc_pause_pattern.match(line)
-        concurrent_match = gc_concurrent_pattern.match(line)
-        pgsz_match = gc_pgsz_pattern.match(line)
-        cause_match = gc_cause_pattern.match(line)
-        version_match = jdk_version_pattern.search(line)
-
-        if pause_match:
-            time, gc_cycle, pause_type, duration = pause_match.groups()
-            gc_pause_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'PauseType': pause_type,
-                'Duration': float(duration)
-            })
-        elif concurrent_match:
-            time, gc_cycle, phase_type, duration = concurrent_match.groups()
-            concurrent_phase_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'PhaseType': phase_type,
-                'Duration': float(duration)
-            })
-        elif pgsz_match:
-            time, gc_cycle, page_type, used_pages, total_pages, empty_pages, relocated_pages, inplace_pages = pgsz_match.groups()
-            gc_pgsz_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'PageType': page_type,
-                'UsedPages': int(used_pages),
-                'TotalPages': int(total_pages),
-                'EmptyPages': int(empty_pages),
-                'RelocatedPages': int(relocated_pages),
-                'InPlacePages': int(inplace_pages)
-            })
-        elif cause_match:
-            time, gc_cycle, cause, before_usage, before_percent, after_usage, after_percent = cause_match.groups()
-            gc_cause_data.append({
-                'Time': float(time),
-                'GCCycle': int(gc_cycle),
-                'Cause': cause,
-                'BeforeUsage': int(before_usage),
-                'BeforePercent': int(before_percent),
-                'AfterUsage': int(after_usage),
-                'AfterPercent': int(after_percent)
-            })
-        elif version_match:
-            jdk_version = version_match.group(1)
-
-    # Convert the lists of data to DataFrames
-    gc_pause_df = pd.DataFrame(gc_pause_data)
-    concurrent_phase_df = pd.DataFrame(concurrent_phase_data)
-    gc_pgsz_df = pd.DataFrame(gc_pgsz_data)
-    gc_cause_df = pd.DataFrame(gc_cause_data)
+
+    # Walk the log a chunk of lines at a time rather than holding a list of every line
+    for line in iter_log_lines(log_content):
+        # Substring tests are much cheaper than the regex and rule out most lines
+        if ('Pause ' not in line and 'Concurrent ' not in line and ' Pages: ' not in line
+                and 'Garbage Collection (' not in line and ' Version: ' not in line):
+            continue
+
+        # Match pause, concurrent phase, page size, cause and version information in a single regex pass
+        match = _MASTER_RE.match(line)
+        if not match:
+            continue
+        kind = match.lastgroup
+        time = match.group(1)
+        fields = match.groups()[_RECORD_GROUPS[kind]]
+
+        if kind == 'pause':
+            gc_cycle, pause_type, duration = fields
+            gc_pause_data['Time'].append(time)
+            gc_pause_data['GCCycle'].append(gc_cycle)
+            gc_pause_data['PauseType'].append(pause_type)
+            gc_pause_data['Duration'].append(duration)
+        elif kind == 'concurrent':
+            gc_cycle, phase_type, duration = fields
+            concurrent_phase_data['Time'].append(time)
+            concurrent_phase_data['GCCycle'].append(gc_cycle)
+            concurrent_phase_data['PhaseType'].append(phase_type)
+            concurrent_phase_data['Duration'].append(duration)
+        elif kind == 'pgsz':
+            gc_cycle, page_type, used_pages, total_pages, empty_pages, relocated_pages, inplace_pages = fields
+            gc_pgsz_data['Time'].append(time)
+            gc_pgsz_data['GCCycle'].append(gc_cycle)
+            gc_pgsz_data['PageType'].append(page_type)
+            gc_pgsz_data['UsedPages'].append(used_pages)
+            gc_pgsz_data['TotalPages'].append(total_pages)
+            gc_pgsz_data['EmptyPages'].append(empty_pages)
+            gc_pgsz_data['RelocatedPages'].append(relocated_pages)
+            gc_pgsz_data['InPlacePages'].append(inplace_pages)
+        elif kind == 'cause':
+            gc_cycle, cause, before_usage, before_percent, after_usage, after_percent = fields
+            gc_cause_data['Time'].append(time)
+            gc_cause_data['GCCycle'].append(gc_cycle)
+            gc_cause_data['Cause'].append(cause)
+            gc_cause_data['BeforeUsage'].append(before_usage)
+            gc_cause_data['BeforePercent'].append(before_percent)
+            gc_cause_data['AfterUsage'].append(after_usage)
+            gc_cause_data['AfterPercent'].append(after_percent)
+        elif kind == 'version':
+            jdk_version = fields[0]
+
+    # Convert the column lists to DataFrames, one typed array per column
+    gc_pause_df = _build_frame(gc_pause_data)
+    concurrent_phase_df = _build_frame(concurrent_phase_data)
+    gc_pgsz_df = _build_frame(gc_pgsz_data)
+    gc_cause_df = _build_frame(gc_cause_data)
 
     return gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, jdk_version
 
+def _build_frame(columns):
+    return build_frame(columns, _COLUMN_DTYPES, _CATEGORY_COLUMNS)
+
 def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, selected_value):
     fig = go.Figure()
     if gc_pause_df.empty or concurrent_phase_df.empty or gc_pgsz_df.empty or gc_cause_df.empty:
         return fig  # Return an empty figure
 
     if selected_value == 'pause':
-        # Add traces for each pause type
+        # Add traces for each pause type; every pause is an event of its own, so the traces are not decimated
         for pause_type in gc_pause_df['PauseType'].unique():
             pause_df = gc_pause_df[gc_pause_df['PauseType'] == pause_type]
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=pause_df['Time'],
                 y=pause_df['Duration'],
                 mode='lines+markers',
@@ -187,10 +229,10 @@ def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, sel
         return fig
 
     elif selected_value == 'concurrent':
-        # Add traces for each concurrent phase type
+        # Add traces for each concurrent phase type, with every phase kept like the pauses
         for phase_type in concurrent_phase_df['PhaseType'].unique():
             phase_df = concurrent_phase_df[concurrent_phase_df['PhaseType'] == phase_type]
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=phase_df['Time'],
                 y=phase_df['Duration'],
                 mode='lines+markers',
@@ -205,11 +247,17 @@ def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, sel
         return fig
 
     elif selected_value == 'pgsz':
-        # Group the data by 'Time' to get the sum of pages for each type at each time point
-        pgsz_grouped = gc_pgsz_df.groupby(['Time', 'PageType']).sum().reset_index()
-        # Plot each page type
-        for page_type in pgsz_grouped['PageType'].unique():
-            page_type_df = pgsz_grouped[pgsz_grouped['PageType'] == page_type]
+        # Group the data by 'Time' to get the sum of pages for each type at each time point.
+        # Logs normally have at most one line per type and time point, in time order, and then the sum changes nothing
+        if gc_pgsz_df['Time'].is_monotonic_increasing and not gc_pgsz_df.duplicated(['Time', 'PageType']).any():
+            pgsz_grouped = gc_pgsz_df
+        else:
+            pgsz_grouped = gc_pgsz_df.groupby(['Time', 'PageType'], observed=True).sum().reset_index()
+        # Plot each page type, partitioning the data in one pass; traces are ordered by each type's first
+        # time point and then by name, as they appear in the grouped data
+        page_type_groups = dict(list(pgsz_grouped.groupby('PageType', sort=False, observed=True)))
+        for page_type in sorted(page_type_groups, key=lambda page_type: (page_type_groups[page_type]['Time'].iloc[0], page_type)):
+            page_type_df = page_type_groups[page_type]
             fig.add_trace(go.Bar(
                 x=page_type_df['Time'],
                 y=page_type_df['UsedPages'],
@@ -235,17 +283,19 @@ def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, sel
             subplot_titles=('GC Over Time', 'GC Cause Distribution'),
             vertical_spacing=0.2  # Adjust the space between the subplots
             )
-        # Plot the 'BeforeUsage' and 'AfterUsage' for each GC cycle
-        fig.add_trace(go.Scatter(
-            x=gc_cause_df['Time'],
-            y=gc_cause_df['BeforeUsage'],
+        # Plot the 'BeforeUsage' and 'AfterUsage' for each GC cycle; like heap sizes, the usage series are decimated
+        time, usage = downsample(gc_cause_df['Time'], gc_cause_df['BeforeUsage'])
+        fig.add_trace(go.Scattergl(
+            x=time,
+            y=usage,
             mode='lines+markers',
             name='Before GC Usage'
         ), row=1, col=1)
 
-        fig.add_trace(go.Scatter(
-            x=gc_cause_df['Time'],
-            y=gc_cause_df['AfterUsage'],
+        time, usage = downsample(gc_cause_df['Time'], gc_cause_df['AfterUsage'])
+        fig.add_trace(go.Scattergl(
+            x=time,
+            y=usage,
             mode='lines+markers',
             name='After GC Usage'
         ), row=1, col=1)
@@ -272,5 +322,5 @@ def generate_plot(gc_pause_df, concurrent_phase_df, gc_pgsz_df, gc_cause_df, sel
         return fig
 
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8052)
+    app.run(debug=True, port=8052)
 